@@ -0,0 +1,27 @@
+"""posts keyset index
+
+Revision ID: 4a7e2c91b0d3
+Revises: 9c9f98a9e456
+Create Date: 2026-10-17 09:12:41.518302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a7e2c91b0d3'
+down_revision = '9c9f98a9e456'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Composite index so the feed can seek on (created_at, id) instead of using OFFSET.
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_created_at_id')
@@ -0,0 +1,73 @@
+"""post counters
+
+Revision ID: 5c3b8f20d6e1
+Revises: 4a7e2c91b0d3
+Create Date: 2026-10-17 10:03:17.204955
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c3b8f20d6e1'
+down_revision = '4a7e2c91b0d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Add denormalized comment/reaction counters to posts and backfill them
+    from the comments and reactions tables.
+    """
+
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('comment_count', sa.Integer(), nullable=False, server_default=sa.text('0')))
+        batch_op.add_column(sa.Column('reaction_count', sa.Integer(), nullable=False, server_default=sa.text('0')))
+        batch_op.add_column(sa.Column('reaction_histogram', sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    posts = sa.table(
+        'posts',
+        sa.column('id', sa.CHAR(length=36)),
+        sa.column('comment_count', sa.Integer()),
+        sa.column('reaction_count', sa.Integer()),
+        sa.column('reaction_histogram', sa.JSON()),
+    )
+    comments = sa.table('comments', sa.column('id'), sa.column('post_id'))
+    reactions = sa.table('reactions', sa.column('id'), sa.column('post_id'), sa.column('type'))
+
+    bind.execute(
+        posts.update().values(
+            comment_count=sa.select(sa.func.count(comments.c.id))
+            .where(comments.c.post_id == posts.c.id)
+            .scalar_subquery()
+        )
+    )
+
+    histograms = {}
+    for post_id, reaction_type, count in bind.execute(
+        sa.select(reactions.c.post_id, reactions.c.type, sa.func.count(reactions.c.id))
+        .group_by(reactions.c.post_id, reactions.c.type)
+    ):
+        histograms.setdefault(post_id, {})[reaction_type] = count
+
+    for post_id, histogram in histograms.items():
+        bind.execute(
+            posts.update()
+            .where(posts.c.id == post_id)
+            .values(reaction_count=sum(histogram.values()), reaction_histogram=histogram)
+        )
+
+    # Remove server_default after initial backfill so future inserts use application default.
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.alter_column('comment_count', server_default=None)
+        batch_op.alter_column('reaction_count', server_default=None)
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('reaction_histogram')
+        batch_op.drop_column('reaction_count')
+        batch_op.drop_column('comment_count')
@@ -0,0 +1,69 @@
+"""post tags table
+
+Revision ID: 6d9a1e47c2f8
+Revises: 5c3b8f20d6e1
+Create Date: 2026-10-17 10:48:52.671330
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d9a1e47c2f8'
+down_revision = '5c3b8f20d6e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Create post_tags and backfill it from the JSON tags column on posts.
+    """
+
+    op.create_table(
+        'post_tags',
+        sa.Column('post_id', sa.CHAR(length=36), nullable=False),
+        sa.Column('tag', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('post_id', 'tag')
+    )
+    with op.batch_alter_table('post_tags', schema=None) as batch_op:
+        batch_op.create_index('ix_post_tags_tag_created_at', ['tag', 'created_at'], unique=False)
+
+    bind = op.get_bind()
+    posts = sa.table('posts', sa.column('id'), sa.column('tags'), sa.column('created_at'))
+    post_tags = sa.table('post_tags', sa.column('post_id'), sa.column('tag'), sa.column('created_at'))
+
+    rows = []
+    for post_id, tags_json, created_at in bind.execute(sa.select(posts.c.id, posts.c.tags, posts.c.created_at)).fetchall():
+        try:
+            tags = json.loads(tags_json or '[]')
+        except (ValueError, TypeError):
+            continue
+        if not isinstance(tags, list):
+            continue
+        seen = set()
+        for tag in tags:
+            if not isinstance(tag, str):
+                continue
+            tag = tag.strip()[:255]
+            # post_tags.tag is case-insensitive on MySQL; keep the first spelling
+            if tag and tag.casefold() not in seen:
+                seen.add(tag.casefold())
+                rows.append({'post_id': post_id, 'tag': tag, 'created_at': created_at})
+        if len(rows) >= 1000:
+            op.bulk_insert(post_tags, rows)
+            rows = []
+    if rows:
+        op.bulk_insert(post_tags, rows)
+
+
+def downgrade():
+    with op.batch_alter_table('post_tags', schema=None) as batch_op:
+        batch_op.drop_index('ix_post_tags_tag_created_at')
+
+    op.drop_table('post_tags')
@@ -0,0 +1,30 @@
+"""post row version
+
+Revision ID: 7e0f4b6a9d15
+Revises: 6d9a1e47c2f8
+Create Date: 2026-10-17 11:31:06.842117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e0f4b6a9d15'
+down_revision = '6d9a1e47c2f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default=sa.text('0')))
+
+    # Remove server_default after initial backfill so future inserts use application default.
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.alter_column('version', server_default=None)
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,27 @@
+"""post tags created_at index
+
+Revision ID: 8f2c5d03a7b9
+Revises: 7e0f4b6a9d15
+Create Date: 2026-10-17 13:20:44.309861
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f2c5d03a7b9'
+down_revision = '7e0f4b6a9d15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Trending topics aggregate every tag within a time window.
+    with op.batch_alter_table('post_tags', schema=None) as batch_op:
+        batch_op.create_index('ix_post_tags_created_at', ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('post_tags', schema=None) as batch_op:
+        batch_op.drop_index('ix_post_tags_created_at')
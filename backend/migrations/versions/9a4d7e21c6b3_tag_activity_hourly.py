@@ -0,0 +1,81 @@
+"""tag activity hourly rollup
+
+Revision ID: 9a4d7e21c6b3
+Revises: 8f2c5d03a7b9
+Create Date: 2026-10-17 14:05:12.448120
+
+"""
+from datetime import datetime, timedelta, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d7e21c6b3'
+down_revision = '8f2c5d03a7b9'
+branch_labels = None
+depends_on = None
+
+
+def _hour(moment):
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def upgrade():
+    """
+    Create tag_activity_hourly and backfill the last 30 days (the widest trending window).
+    """
+
+    op.create_table(
+        'tag_activity_hourly',
+        sa.Column('tag', sa.String(length=255), nullable=False),
+        sa.Column('hour', sa.DateTime(), nullable=False),
+        sa.Column('posts', sa.Integer(), nullable=False),
+        sa.Column('comments', sa.Integer(), nullable=False),
+        sa.Column('reactions', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('tag', 'hour')
+    )
+    with op.batch_alter_table('tag_activity_hourly', schema=None) as batch_op:
+        batch_op.create_index('ix_tag_activity_hourly_hour', ['hour'], unique=False)
+
+    bind = op.get_bind()
+    since = datetime.now(timezone.utc) - timedelta(days=30)
+    post_tags = sa.table('post_tags', sa.column('post_id'), sa.column('tag'), sa.column('created_at'))
+    comments = sa.table('comments', sa.column('post_id'), sa.column('created_at'))
+    reactions = sa.table('reactions', sa.column('post_id'), sa.column('created_at'))
+    tag_activity = sa.table(
+        'tag_activity_hourly',
+        sa.column('tag'), sa.column('hour'), sa.column('posts'), sa.column('comments'), sa.column('reactions')
+    )
+
+    sources = [
+        sa.select(post_tags.c.tag, post_tags.c.created_at).where(post_tags.c.created_at >= since),
+        sa.select(post_tags.c.tag, comments.c.created_at)
+            .select_from(post_tags.join(comments, comments.c.post_id == post_tags.c.post_id))
+            .where(comments.c.created_at >= since),
+        sa.select(post_tags.c.tag, reactions.c.created_at)
+            .select_from(post_tags.join(reactions, reactions.c.post_id == post_tags.c.post_id))
+            .where(reactions.c.created_at >= since),
+    ]
+    buckets = {}
+    for index, query in enumerate(sources):
+        for tag, created_at in bind.execute(query).fetchall():
+            counts = buckets.setdefault((tag, _hour(created_at)), [0, 0, 0])
+            counts[index] += 1
+
+    rows = [
+        {'tag': tag, 'hour': hour, 'posts': counts[0], 'comments': counts[1], 'reactions': counts[2]}
+        for (tag, hour), counts in buckets.items()
+    ]
+    for start in range(0, len(rows), 1000):
+        op.bulk_insert(tag_activity, rows[start:start + 1000])
+
+
+def downgrade():
+    with op.batch_alter_table('tag_activity_hourly', schema=None) as batch_op:
+        batch_op.drop_index('ix_tag_activity_hourly_hour')
+
+    op.drop_table('tag_activity_hourly')
@@ -0,0 +1,55 @@
+"""discussion hot score
+
+Revision ID: a3e85c1f47d2
+Revises: 9a4d7e21c6b3
+Create Date: 2026-10-17 15:12:37.905514
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3e85c1f47d2'
+down_revision = '9a4d7e21c6b3'
+branch_labels = None
+depends_on = None
+
+# Matches the application default (HOT_SCORE_GRAVITY); the periodic refresh corrects any difference.
+GRAVITY = 1.5
+
+
+def upgrade():
+    with op.batch_alter_table('discussion_analytics', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('hot_score', sa.Double(), nullable=False, server_default=sa.text('0')))
+
+    bind = op.get_bind()
+    analytics = sa.table(
+        'discussion_analytics',
+        sa.column('id'), sa.column('post_id'), sa.column('discussion_score'), sa.column('hot_score')
+    )
+    posts = sa.table('posts', sa.column('id'), sa.column('created_at'))
+    now = datetime.now(timezone.utc)
+    rows = bind.execute(
+        sa.select(analytics.c.id, analytics.c.discussion_score, posts.c.created_at)
+        .select_from(analytics.join(posts, posts.c.id == analytics.c.post_id))
+    ).fetchall()
+    for analytics_id, discussion_score, created_at in rows:
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        age_hours = max((now - created_at).total_seconds() / 3600, 0)
+        hot_score = max(discussion_score or 0, 0) / (age_hours + 2) ** GRAVITY
+        bind.execute(analytics.update().where(analytics.c.id == analytics_id).values(hot_score=hot_score))
+
+    # Remove server_default after initial backfill so future inserts use application default.
+    with op.batch_alter_table('discussion_analytics', schema=None) as batch_op:
+        batch_op.alter_column('hot_score', server_default=None)
+        batch_op.create_index('ix_discussion_analytics_hot_score_post_id', ['hot_score', 'post_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('discussion_analytics', schema=None) as batch_op:
+        batch_op.drop_index('ix_discussion_analytics_hot_score_post_id')
+        batch_op.drop_column('hot_score')
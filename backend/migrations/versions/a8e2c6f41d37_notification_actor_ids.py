@@ -0,0 +1,27 @@
+"""notification actor ids
+
+Revision ID: a8e2c6f41d37
+Revises: f3b7d20c8e15
+Create Date: 2026-10-18 10:52:06.381447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8e2c6f41d37'
+down_revision = 'f3b7d20c8e15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing rows stay NULL; create_notification seeds them from latest_actors on their next event.
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('actor_ids', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_column('actor_ids')
@@ -0,0 +1,29 @@
+"""cache versions
+
+Revision ID: b4f9e1d73a52
+Revises: a8e2c6f41d37
+Create Date: 2026-10-18 11:36:20.714593
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4f9e1d73a52'
+down_revision = 'a8e2c6f41d37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cache_versions',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('cache_versions')
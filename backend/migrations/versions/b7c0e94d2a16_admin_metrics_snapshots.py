@@ -0,0 +1,35 @@
+"""admin metrics snapshots
+
+Revision ID: b7c0e94d2a16
+Revises: a3e85c1f47d2
+Create Date: 2026-10-17 16:02:51.317644
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c0e94d2a16'
+down_revision = 'a3e85c1f47d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'admin_metrics_snapshots',
+        sa.Column('id', sa.CHAR(length=36), nullable=False),
+        sa.Column('metrics', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('admin_metrics_snapshots', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_admin_metrics_snapshots_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('admin_metrics_snapshots', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_admin_metrics_snapshots_created_at'))
+
+    op.drop_table('admin_metrics_snapshots')
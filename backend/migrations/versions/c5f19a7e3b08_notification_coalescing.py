@@ -0,0 +1,36 @@
+"""notification coalescing
+
+Revision ID: c5f19a7e3b08
+Revises: b7c0e94d2a16
+Create Date: 2026-10-17 16:48:19.562301
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f19a7e3b08'
+down_revision = 'b7c0e94d2a16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('group_key', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('actor_count', sa.Integer(), nullable=False, server_default=sa.text('1')))
+        batch_op.add_column(sa.Column('latest_actors', sa.JSON(), nullable=True))
+
+    # Remove server_default after initial backfill so future inserts use application default.
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.alter_column('actor_count', server_default=None)
+        batch_op.create_index('ix_notifications_user_id_type_group_key', ['user_id', 'type', 'group_key'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_id_type_group_key')
+        batch_op.drop_column('latest_actors')
+        batch_op.drop_column('actor_count')
+        batch_op.drop_column('group_key')
@@ -0,0 +1,33 @@
+"""notification first event time
+
+Revision ID: c9e3a5d18f40
+Revises: b4f9e1d73a52
+Create Date: 2026-10-19 09:14:27.503118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9e3a5d18f40'
+down_revision = 'b4f9e1d73a52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('first_event_at', sa.TIMESTAMP(timezone=True), nullable=True,
+                                      server_default=sa.text('CURRENT_TIMESTAMP')))
+
+    # Existing groups restart their coalesce window from their latest event
+    op.execute("UPDATE notifications SET first_event_at = created_at")
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.alter_column('first_event_at', existing_type=sa.TIMESTAMP(timezone=True), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_column('first_event_at')
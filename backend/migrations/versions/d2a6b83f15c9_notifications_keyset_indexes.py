@@ -0,0 +1,29 @@
+"""notifications keyset indexes
+
+Revision ID: d2a6b83f15c9
+Revises: c5f19a7e3b08
+Create Date: 2026-10-17 17:41:03.225870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a6b83f15c9'
+down_revision = 'c5f19a7e3b08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Cursor pages of a user's notifications (unread-only and all) are index range scans.
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_user_id_is_read_created_at', ['user_id', 'is_read', 'created_at'], unique=False)
+        batch_op.create_index('ix_notifications_user_id_created_at', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_id_created_at')
+        batch_op.drop_index('ix_notifications_user_id_is_read_created_at')
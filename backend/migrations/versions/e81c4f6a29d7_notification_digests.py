@@ -0,0 +1,26 @@
+"""notification digests
+
+Revision ID: e81c4f6a29d7
+Revises: d2a6b83f15c9
+Create Date: 2026-10-17 19:12:44.508213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e81c4f6a29d7'
+down_revision = 'd2a6b83f15c9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_notification_digest_at', sa.TIMESTAMP(timezone=True), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('last_notification_digest_at')
@@ -0,0 +1,30 @@
+"""periodic job locks
+
+Revision ID: f3b7d20c8e15
+Revises: e81c4f6a29d7
+Create Date: 2026-10-18 10:14:37.902156
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b7d20c8e15'
+down_revision = 'e81c4f6a29d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'periodic_job_locks',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('owner', sa.CHAR(length=36), nullable=False),
+        sa.Column('locked_until', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('periodic_job_locks')
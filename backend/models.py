@@ -1,5 +1,7 @@
 import uuid
 import json
+from datetime import timezone
+from flask import g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import text
 
@@ -23,6 +25,8 @@ class User(db.Model):
     bio = db.Column(db.Text)
     # Newsletter preferences
     newsletter_opt_out = db.Column(db.Boolean, nullable=False, default=False)
+    # When the last offline notification digest was claimed for this user
+    last_notification_digest_at = db.Column(db.TIMESTAMP(timezone=True), nullable=True)
 
     # Business / Organization profile fields
     is_business = db.Column(db.Boolean, nullable=False, default=False)
@@ -53,6 +57,27 @@ class User(db.Model):
         # Business fields are optional and not counted towards basic profile completion
         return int((completed_fields / 4) * 100)
 
+    def to_summary_dict(self):
+        """
+        UserSummary projection used for nested authors (feed, comments, feedback, etc.).
+        Memoized per request, so an author appearing many times is serialized once,
+        and deliberately free of private fields such as email.
+        """
+        cache = g.setdefault('_user_summaries', {}) if has_app_context() else None
+        if cache is not None and self.id in cache:
+            return cache[self.id]
+        summary = {
+            "id": str(self.id),
+            "name": self.name,
+            "avatarUrl": self.avatar_url,
+            "title": self.title,
+            "role": self.role,
+            "expertiseLevel": self.expertise_level,
+        }
+        if cache is not None:
+            cache[self.id] = summary
+        return summary
+
     def to_dict(self):
         return {
             "id": str(self.id),
@@ -82,9 +107,19 @@ class Post(db.Model):
     display_name = db.Column(db.Text, nullable=False)
     tags = db.Column(db.Text, nullable=False, default='[]') # Stored as a JSON string
     created_at = db.Column(db.TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
+    # Denormalized counters, maintained in the same transaction as comment/reaction writes
+    comment_count = db.Column(db.Integer, nullable=False, default=0)
+    reaction_count = db.Column(db.Integer, nullable=False, default=0)
+    reaction_histogram = db.Column(db.JSON, nullable=True)  # e.g. {"HEART": 3, "CLAP": 1}
+    # Incremented on every change to the post or its comments/reactions; feeds the post ETag
+    version = db.Column(db.Integer, nullable=False, default=0)
     
     comments = db.relationship('Comment', backref='post', lazy=True, cascade="all, delete-orphan")
     reactions = db.relationship('Reaction', backref='post', lazy=True, cascade="all, delete-orphan")
+    tag_entries = db.relationship('PostTag', backref='post', lazy=True, cascade="all, delete-orphan")
+
+    # Backs keyset pagination of the feed: ORDER BY created_at DESC, id DESC
+    __table_args__ = (db.Index('ix_posts_created_at_id', 'created_at', 'id'),)
 
     @property
     def tags_list(self):
@@ -106,11 +141,12 @@ class Post(db.Model):
         result = {
             "id": str(self.id), "authorId": str(self.author_id), "text": self.text, "mediaUrl": self.media_url,
             "mediaType": self.media_type, "displayName": self.display_name, "createdAt": self.created_at.isoformat(),
-            "author": self.author.to_dict() if self.author else None, "tags": json.loads(self.tags or '[]'),
-            "commentCount": len(self.comments), "reactionCount": len(self.reactions)
+            "author": self.author.to_summary_dict() if self.author else None, "tags": json.loads(self.tags or '[]'),
+            "commentCount": self.comment_count or 0, "reactionCount": self.reaction_count or 0,
+            "reactionCounts": self.reaction_histogram or {}
         }
         if include_comments:
-            result["comments"] = [comment.to_dict() for comment in (self.comments or [])]
+            result["comments"] = build_comment_tree(self.comments or [])
         if include_reactions:
             result["reactions"] = [reaction.to_dict() for reaction in (self.reactions or [])]
         return result
@@ -118,8 +154,15 @@ class Post(db.Model):
     def to_dict_detailed(self):
         return self.to_dict(include_comments=True, include_reactions=True)
     
-    def to_dict_feed(self):
-        """Optimized method for feed display - minimal data for performance"""
+    def to_dict_feed(self, full_author=False, comments=None):
+        """
+        Optimized method for feed display - minimal data for performance.
+        Pass already-serialized comments to embed a preview instead of the full thread.
+        """
+        if self.author:
+            author = self.author.to_dict() if full_author else self.author.to_summary_dict()
+        else:
+            author = None
         return {
             "id": str(self.id), 
             "authorId": str(self.author_id), 
@@ -128,14 +171,37 @@ class Post(db.Model):
             "mediaType": self.media_type, 
             "displayName": self.display_name, 
             "createdAt": self.created_at.isoformat(),
-            "author": self.author.to_dict() if self.author else None, 
+            "author": author, 
             "tags": json.loads(self.tags or '[]'),
-            "commentCount": len(self.comments), 
-            "reactionCount": len(self.reactions),
+            "commentCount": self.comment_count or 0, 
+            "reactionCount": self.reaction_count or 0,
+            "reactionCounts": self.reaction_histogram or {},
             "reactions": [reaction.to_dict() for reaction in (self.reactions or [])],
-            "comments": [comment.to_dict() for comment in (self.comments or [])]
+            "comments": comments if comments is not None else build_comment_tree(self.comments or [])
         }
 
+class PostTag(db.Model):
+    """Normalized copy of Post.tags so tag filters and trending queries can use an index."""
+    __tablename__ = 'post_tags'
+    post_id = db.Column(db.CHAR(36), db.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True)
+    tag = db.Column(db.String(255), primary_key=True)
+    # Copy of posts.created_at so tag-filtered feeds are served straight from the (tag, created_at) index
+    created_at = db.Column(db.TIMESTAMP(timezone=True), nullable=False)
+    __table_args__ = (
+        db.Index('ix_post_tags_tag_created_at', 'tag', 'created_at'),
+        db.Index('ix_post_tags_created_at', 'created_at'),  # trending windows scan by time across tags
+    )
+
+class TagActivityHourly(db.Model):
+    """Per-tag activity rolled up by UTC hour; trending windows sum at most 720 buckets per tag."""
+    __tablename__ = 'tag_activity_hourly'
+    tag = db.Column(db.String(255), primary_key=True)
+    hour = db.Column(db.DateTime, primary_key=True)  # naive UTC, truncated to the hour
+    posts = db.Column(db.Integer, nullable=False, default=0)
+    comments = db.Column(db.Integer, nullable=False, default=0)
+    reactions = db.Column(db.Integer, nullable=False, default=0)
+    __table_args__ = (db.Index('ix_tag_activity_hourly_hour', 'hour'),)
+
 class Comment(db.Model):
     __tablename__ = 'comments'
     id = db.Column(db.CHAR(36), primary_key=True, default=generate_uuid_str)
@@ -149,6 +215,10 @@ class Comment(db.Model):
     reactions = db.relationship('CommentReaction', backref='comment', cascade="all, delete-orphan")
 
     def to_dict(self):
+        """
+        Serialize a single comment. Replies are not walked here (that was one lazy
+        query per comment); build_comment_tree fills "replies" and "replyCount".
+        """
         # Calculate reaction counts by type
         reaction_counts = {}
         for reaction in (self.reactions or []):
@@ -162,13 +232,33 @@ class Comment(db.Model):
             "parentCommentId": str(self.parent_comment_id) if self.parent_comment_id else None,
             "text": self.text, 
             "createdAt": self.created_at.isoformat(),
-            "author": self.author.to_dict() if self.author else None,
-            "replyCount": len(self.replies) if self.replies else 0,
-            "replies": [reply.to_dict() for reply in (self.replies or [])],
+            "author": self.author.to_summary_dict() if self.author else None,
+            "replyCount": 0,
+            "replies": [],
             "reactionCounts": reaction_counts,
             "reactions": [reaction.to_dict() for reaction in (self.reactions or [])]
         }
 
+def build_comment_tree(comments):
+    """
+    Assemble the already-loaded comments of a post into a reply tree in O(n).
+    Returns the top-level comment dicts in chronological order; every comment
+    appears exactly once, nested under its parent.
+    """
+    ordered = sorted(comments, key=lambda comment: (comment.created_at, comment.id))
+    nodes = {comment.id: comment.to_dict() for comment in ordered}
+    roots = []
+    for comment in ordered:
+        node = nodes[comment.id]
+        parent = nodes.get(comment.parent_comment_id) if comment.parent_comment_id else None
+        if parent is not None:
+            parent["replies"].append(node)
+            parent["replyCount"] += 1
+        else:
+            # Top-level comments, plus replies whose parent is missing
+            roots.append(node)
+    return roots
+
 class Reaction(db.Model):
     __tablename__ = 'reactions'
     id = db.Column(db.CHAR(36), primary_key=True, default=generate_uuid_str)
@@ -201,10 +291,16 @@ class DiscussionAnalytics(db.Model):
     total_downvotes = db.Column(db.Integer, nullable=False, default=0)
     expert_participants = db.Column(db.Integer, nullable=False, default=0)
     discussion_score = db.Column(db.Float, nullable=False, default=0.0)
+    # Time-decayed ranking key for the hot list; DOUBLE so keyset cursors round-trip exactly
+    hot_score = db.Column(db.Double, nullable=False, default=0.0)
     last_activity = db.Column(db.TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
     created_at = db.Column(db.TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
     updated_at = db.Column(db.TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
 
+    __table_args__ = (
+        db.Index('ix_discussion_analytics_hot_score_post_id', 'hot_score', 'post_id'),
+    )
+
     def to_dict(self):
         return {
             "id": str(self.id),
@@ -215,6 +311,7 @@ class DiscussionAnalytics(db.Model):
             "totalDownvotes": self.total_downvotes,
             "expertParticipants": self.expert_participants,
             "discussionScore": self.discussion_score,
+            "hotScore": self.hot_score,
             "lastActivity": self.last_activity.isoformat(),
             "createdAt": self.created_at.isoformat(),
             "updatedAt": self.updated_at.isoformat()
@@ -229,8 +326,24 @@ class Notification(db.Model):
     message = db.Column(db.Text, nullable=False)
     data = db.Column(db.JSON, nullable=True)
     is_read = db.Column(db.Boolean, nullable=False, default=False)
+    # Notifications sharing (user, type, group_key) within a window of the group's first event
+    # (first_event_at) are coalesced into one row; created_at moves to the latest event for ordering
+    group_key = db.Column(db.String(255), nullable=True)
+    actor_count = db.Column(db.Integer, nullable=False, default=1)
+    latest_actors = db.Column(db.JSON, nullable=True)
+    # Distinct actor ids of the group, capped at NOTIFICATION_MAX_ACTOR_IDS; past the cap
+    # actor_count keeps counting on its own
+    actor_ids = db.Column(db.JSON, nullable=True)
+    first_event_at = db.Column(db.TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
     created_at = db.Column(db.TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now())
 
+    __table_args__ = (
+        db.Index('ix_notifications_user_id_type_group_key', 'user_id', 'type', 'group_key'),
+        # Keyset pages of a user's unread (and all) notifications, newest first
+        db.Index('ix_notifications_user_id_is_read_created_at', 'user_id', 'is_read', 'created_at'),
+        db.Index('ix_notifications_user_id_created_at', 'user_id', 'created_at'),
+    )
+
     def to_dict(self):
         return {
             "id": str(self.id),
@@ -240,6 +353,9 @@ class Notification(db.Model):
             "message": self.message,
             "data": self.data or {},
             "isRead": self.is_read,
+            "groupKey": self.group_key,
+            "actorCount": self.actor_count or 1,
+            "latestActors": self.latest_actors or [],
             "createdAt": self.created_at.isoformat()
         }
 
@@ -266,7 +382,7 @@ class BroadcastMessage(db.Model):
             "createdBy": str(self.created_by),
             "createdAt": self.created_at.isoformat(),
             "updatedAt": self.updated_at.isoformat(),
-            "creator": self.creator.to_dict() if self.creator else None
+            "creator": self.creator.to_summary_dict() if self.creator else None
         }
 
 
@@ -351,7 +467,7 @@ class NCLEXCourse(db.Model):
             "description": self.description,
             "status": self.status,
             "createdBy": str(self.created_by) if self.created_by else None,
-            "creator": self.creator.to_dict() if self.creator else None,
+            "creator": self.creator.to_summary_dict() if self.creator else None,
             "publishedAt": self.published_at.isoformat() if self.published_at else None,
             "createdAt": self.created_at.isoformat() if self.created_at else None,
             "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
@@ -672,9 +788,36 @@ class Feedback(db.Model):
             "status": self.status,
             "createdAt": self.created_at.isoformat(),
             "updatedAt": self.updated_at.isoformat(),
-            "author": self.author.to_dict() if self.author else None
+            "author": self.author.to_summary_dict() if self.author else None
         }
 
+class CacheVersion(db.Model):
+    """Version counters behind cache invalidation and ETags when Redis is not configured."""
+    __tablename__ = 'cache_versions'
+    name = db.Column(db.String(100), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+class PeriodicJobLock(db.Model):
+    """Cross-worker lease for a periodic job: only the worker that claims an expired lease runs it."""
+    __tablename__ = 'periodic_job_locks'
+    name = db.Column(db.String(100), primary_key=True)
+    owner = db.Column(db.CHAR(36), nullable=False)
+    locked_until = db.Column(db.TIMESTAMP(timezone=True), nullable=False)
+
+class AdminMetricsSnapshot(db.Model):
+    """Precomputed admin dashboard metrics; the newest row is served by /api/admin/metrics."""
+    __tablename__ = 'admin_metrics_snapshots'
+    id = db.Column(db.CHAR(36), primary_key=True, default=generate_uuid_str)
+    metrics = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.TIMESTAMP(timezone=True), nullable=False, server_default=db.func.now(), index=True)
+
+    def to_dict(self):
+        generated_at = self.created_at
+        if generated_at.tzinfo is None:
+            # Some drivers return TIMESTAMP values naive; they are stored in UTC
+            generated_at = generated_at.replace(tzinfo=timezone.utc)
+        return {**self.metrics, "generatedAt": generated_at.isoformat()}
+
 # --- CONVERSATION MODELS ---
 
 class Conversation(db.Model):
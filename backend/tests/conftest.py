@@ -0,0 +1,67 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+from sqlalchemy import event
+
+# Always run against a throwaway in-memory database, never a configured one
+os.environ['DB_CONNECTION_STRING'] = 'sqlite://'
+os.environ['PERIODIC_JOBS_ENABLED'] = 'false'
+os.environ.pop('REDIS_URL', None)
+os.environ.pop('SOCKETIO_MESSAGE_QUEUE', None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as app_module  # noqa: E402
+from models import User  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    flask_app = app_module.app
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        app_module.db.create_all()
+        yield flask_app
+        app_module.db.session.remove()
+        app_module.db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def statements(app):
+    """SQL statements sent to the database while the test runs."""
+    executed = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    engine = app_module.db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.fixture
+def make_user(app):
+    def make(name='User', **fields):
+        user = User(name=name, email=f'{app_module.uuid.uuid4().hex}@example.com', password='x', role='NURSE', **fields)
+        app_module.db.session.add(user)
+        app_module.db.session.flush()
+        return user
+    return make
+
+
+@pytest.fixture
+def access_token(app):
+    def token(user):
+        return jwt.encode(
+            {'user_id': user.id, 'exp': datetime.utcnow() + timedelta(hours=1)},
+            app.config['SECRET_KEY'], algorithm='HS256'
+        )
+    return token
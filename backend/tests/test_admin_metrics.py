@@ -0,0 +1,13 @@
+from datetime import datetime
+
+import app as app_module
+from models import AdminMetricsSnapshot
+
+
+def test_snapshot_timestamp_is_serialized_with_its_utc_offset(app):
+    app_module.refresh_admin_metrics()
+    app_module.db.session.expire_all()
+
+    generated_at = datetime.fromisoformat(AdminMetricsSnapshot.query.one().to_dict()['generatedAt'])
+    assert generated_at.utcoffset() is not None
+    assert generated_at.utcoffset().total_seconds() == 0
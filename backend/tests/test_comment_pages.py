@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+
+import app as app_module
+from models import Comment, Post
+
+db = app_module.db
+
+
+def seed_thread(make_user, replies_per_comment):
+    """A post with one top-level comment per entry of replies_per_comment, oldest first."""
+    author = make_user('Author')
+    post = Post(author_id=author.id, text='Post', display_name='Author')
+    db.session.add(post)
+    db.session.flush()
+    start = datetime.now(timezone.utc) - timedelta(hours=1)
+    comment_ids = []
+    for i, reply_count in enumerate(replies_per_comment):
+        comment = Comment(post_id=post.id, author_id=author.id, text=f'Comment {i}', created_at=start + timedelta(minutes=i))
+        db.session.add(comment)
+        db.session.flush()
+        comment_ids.append(comment.id)
+        for j in range(reply_count):
+            db.session.add(Comment(
+                post_id=post.id, author_id=author.id, parent_comment_id=comment.id, text=f'Reply {i}.{j}',
+                created_at=start + timedelta(minutes=i, seconds=j + 1)
+            ))
+    db.session.commit()
+    return author, post, comment_ids
+
+
+def get_comments(client, token, post, **params):
+    response = client.get(
+        f'/api/posts/{post.id}/comments', query_string=params, headers={'Authorization': f'Bearer {token}'}
+    )
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_reply_limit_zero_still_offers_a_cursor_to_threads_with_replies(client, make_user, access_token):
+    author, post, _ = seed_thread(make_user, [1, 0])
+    page = get_comments(client, access_token(author), post, replyLimit=0)
+
+    assert [(comment['text'], comment['replyCount'], comment['replies'], comment['repliesNextCursor'])
+            for comment in page['comments']] == [('Comment 0', 1, [], ''), ('Comment 1', 0, [], None)]
+
+
+def test_partial_preview_then_paging_replies_by_parent(client, make_user, access_token):
+    author, post, (thread_id, quiet_id) = seed_thread(make_user, [5, 2])
+    token = access_token(author)
+
+    page = get_comments(client, token, post, replyLimit=2)
+    thread, quiet = page['comments']
+    assert [reply['text'] for reply in thread['replies']] == ['Reply 0.0', 'Reply 0.1']
+    assert thread['repliesNextCursor']
+    # Exactly as many replies as the preview shows: nothing more to load
+    assert [reply['text'] for reply in quiet['replies']] == ['Reply 1.0', 'Reply 1.1']
+    assert quiet['repliesNextCursor'] is None
+
+    cursor, loaded = thread['repliesNextCursor'], []
+    while cursor is not None:
+        replies = get_comments(client, token, post, parentId=thread_id, cursor=cursor, limit=2)
+        loaded += [reply['text'] for reply in replies['comments']]
+        cursor = replies['nextCursor']
+    assert loaded == ['Reply 0.2', 'Reply 0.3', 'Reply 0.4']
@@ -0,0 +1,38 @@
+import app as app_module
+from models import Comment, CommentReaction, DiscussionAnalytics, Post
+
+db = app_module.db
+
+
+def test_refresh_scores_users_and_promotes_experts(app, make_user, monkeypatch):
+    monkeypatch.setattr(app_module, 'INTERMEDIATE_CONTRIBUTION_SCORE', 2)
+    monkeypatch.setattr(app_module, 'EXPERT_CONTRIBUTION_SCORE', 5)
+    author, writer, fan = make_user('Author'), make_user('Writer'), make_user('Fan')
+    post = Post(author_id=author.id, text='Post', display_name='Author')
+    db.session.add(post)
+    db.session.flush()
+    first = Comment(post_id=post.id, author_id=writer.id, text='First')
+    db.session.add(first)
+    db.session.flush()
+    db.session.add_all([
+        Comment(post_id=post.id, author_id=writer.id, text='Second'),
+        Comment(post_id=post.id, author_id=writer.id, text='Reply', parent_comment_id=first.id),
+        CommentReaction(comment_id=first.id, user_id=fan.id, type='UPVOTE'),
+        CommentReaction(comment_id=first.id, user_id=fan.id, type='EXPERT'),
+        # Reactions on one's own comments don't count
+        CommentReaction(comment_id=first.id, user_id=writer.id, type='HELPFUL'),
+    ])
+    app_module.recompute_discussion_analytics(post.id)
+    db.session.commit()
+    assert DiscussionAnalytics.query.one().expert_participants == 0
+
+    assert app_module.refresh_contribution_scores(batch_size=2) == (3, 1)
+    db.session.expire_all()
+    # Two comments, one reply, an upvote and an endorsement: 2 + 0.5 + 2 + 3
+    assert writer.discussion_contribution_score == 7.5
+    assert writer.expertise_level == 'EXPERT'
+    assert fan.expertise_level == 'BEGINNER'
+    assert DiscussionAnalytics.query.one().expert_participants == 1
+
+    # Nothing changed, so nothing is written
+    assert app_module.refresh_contribution_scores(batch_size=2) == (3, 0)
@@ -0,0 +1,37 @@
+import app as app_module
+from models import DiscussionAnalytics, Post
+
+db = app_module.db
+
+
+def snapshot(analytics):
+    db.session.refresh(analytics)
+    return (analytics.total_comments, analytics.total_replies, analytics.total_upvotes,
+            analytics.total_downvotes, analytics.discussion_score)
+
+
+def test_write_deltas_match_a_full_recompute(app, client, make_user, access_token, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(app_module, 'schedule_discussion_recompute', scheduled.append)
+    author, ann = make_user('Author'), make_user('Ann')
+    post = Post(author_id=author.id, text='Post', display_name='Author')
+    db.session.add(post)
+    db.session.flush()
+    app_module.recompute_discussion_analytics(post.id)
+    db.session.commit()
+    headers = {'Authorization': f'Bearer {access_token(ann)}'}
+
+    first = client.post(f'/api/posts/{post.id}/comments', json={'text': 'First'}, headers=headers)
+    client.post(f'/api/posts/{post.id}/comments', json={'text': 'Second'}, headers=headers)
+    client.post(f'/api/posts/{post.id}/comments',
+                json={'text': 'Reply', 'parentCommentId': first.get_json()['id']}, headers=headers)
+
+    # Applied in the write transaction, before any background recompute ran
+    analytics = DiscussionAnalytics.query.filter_by(post_id=post.id).one()
+    by_delta = snapshot(analytics)
+    assert by_delta[:2] == (2, 1)
+    assert scheduled == [post.id] * 3
+
+    app_module.recompute_discussion_analytics(post.id)
+    db.session.commit()
+    assert snapshot(analytics) == by_delta
@@ -0,0 +1,75 @@
+import app as app_module
+from models import Conversation, ConversationMessage, Post
+
+db = app_module.db
+
+
+def revalidate(client, url, headers):
+    """GET url twice: the second request sends the first ETag back. Returns (first, second)."""
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200 and first.headers.get('ETag')
+    second = client.get(url, headers={**headers, 'If-None-Match': first.headers['ETag']})
+    return first, second
+
+
+def seed_post(make_user):
+    author = make_user('Author')
+    post = Post(author_id=author.id, text='Post', display_name='Author')
+    db.session.add(post)
+    db.session.commit()
+    return author, post
+
+
+def react(client, headers, post):
+    response = client.post(f'/api/posts/{post.id}/reactions', json={'type': 'HEART'}, headers=headers)
+    assert response.status_code in (200, 201)
+
+
+def test_feed_etag_revalidates_until_a_write(app, client, make_user, access_token):
+    author, post = seed_post(make_user)
+    headers = {'Authorization': f'Bearer {access_token(author)}'}
+
+    first, second = revalidate(client, '/api/posts', headers)
+    assert second.status_code == 304
+
+    react(client, headers, post)
+    third = client.get('/api/posts', headers={**headers, 'If-None-Match': first.headers['ETag']})
+    assert third.status_code == 200
+    assert third.headers['ETag'] != first.headers['ETag']
+
+
+def test_post_detail_etag_revalidates_until_a_write(app, client, make_user, access_token):
+    author, post = seed_post(make_user)
+    headers = {'Authorization': f'Bearer {access_token(author)}'}
+    url = f'/api/posts/{post.id}'
+
+    first, second = revalidate(client, url, headers)
+    assert second.status_code == 304
+
+    react(client, headers, post)
+    third = client.get(url, headers={**headers, 'If-None-Match': first.headers['ETag']})
+    assert third.status_code == 200
+    assert third.get_json()['reactions']
+
+
+def test_conversations_etag_ignores_messages_of_unlisted_conversations(app, client, make_user, access_token):
+    user = make_user('Nurse')
+    active = Conversation(title='Night shift', description='Tips', created_by=user.id)
+    archived = Conversation(title='Old', description='Closed', created_by=user.id, status='INACTIVE')
+    db.session.add_all([active, archived])
+    db.session.commit()
+    headers = {'Authorization': f'Bearer {access_token(user)}'}
+
+    first, second = revalidate(client, '/api/conversations', headers)
+    assert second.status_code == 304
+
+    db.session.add(ConversationMessage(conversation_id=archived.id, user_id=user.id, message='Late reply'))
+    db.session.commit()
+    unchanged = client.get('/api/conversations', headers={**headers, 'If-None-Match': first.headers['ETag']})
+    assert unchanged.status_code == 304
+
+    response = client.post(f'/api/conversations/{active.id}/messages', json={'message': 'Hello'}, headers=headers)
+    assert response.status_code == 201
+    third = client.get('/api/conversations', headers={**headers, 'If-None-Match': first.headers['ETag']})
+    assert third.status_code == 200
+    assert third.get_json()[0]['messageCount'] == 1
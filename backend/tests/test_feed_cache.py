@@ -0,0 +1,23 @@
+import app as app_module
+
+
+def test_feed_versions_are_shared_between_workers(app):
+    # Two counters with the same name stand in for two workers without Redis
+    this_worker = app_module.VersionCounter('feed-test')
+    other_worker = app_module.VersionCounter('feed-test')
+    before = other_worker.get()
+
+    this_worker.bump()
+    assert other_worker.get() != before
+    assert other_worker.get() == this_worker.get()
+
+
+def test_a_write_on_another_worker_invalidates_cached_pages(app):
+    this_worker = app_module.FeedCache(16, 300)
+    other_worker = app_module.FeedCache(16, 300)
+    version = this_worker.version()
+    this_worker.set(version, ('page',), '{"posts": []}')
+    assert this_worker.get(this_worker.version(), ('page',)) == '{"posts": []}'
+
+    other_worker.bump()
+    assert this_worker.get(this_worker.version(), ('page',)) is None
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta, timezone
+
+import app as app_module
+from models import Post
+
+db = app_module.db
+
+
+def seed_posts(make_user, created_ats):
+    author = make_user('Author')
+    posts = [Post(author_id=author.id, text=f'Post {i}', display_name='Author', created_at=created_at)
+             for i, created_at in enumerate(created_ats)]
+    db.session.add_all(posts)
+    db.session.commit()
+    # Feed order: created_at desc, then id desc
+    return [post.id for post in sorted(posts, key=lambda post: (post.created_at, post.id), reverse=True)]
+
+
+def walk_feed(client, limit):
+    ids, cursor, pages = [], '', 0
+    while cursor is not None:
+        response = client.get('/api/posts', query_string={'cursor': cursor, 'limit': limit})
+        assert response.status_code == 200
+        page = response.get_json()
+        ids += [post['id'] for post in page['posts']]
+        cursor = page['nextCursor']
+        pages += 1
+    return ids, pages
+
+
+def test_cursor_round_trips():
+    created_at = datetime(2026, 10, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    cursor = app_module.encode_cursor(created_at, 'a1b2')
+    assert app_module.decode_cursor(cursor) == (created_at, 'a1b2')
+
+
+def test_cursor_pages_cover_the_feed_once(app, client, make_user):
+    now = datetime.now(timezone.utc)
+    expected = seed_posts(make_user, [now - timedelta(minutes=i) for i in range(7)])
+
+    ids, pages = walk_feed(client, limit=3)
+    assert ids == expected
+    assert pages == 3
+
+
+def test_page_boundary_inside_a_created_at_tie(app, client, make_user):
+    now = datetime.now(timezone.utc)
+    # Five posts share one timestamp, so every page boundary falls inside the tie
+    expected = seed_posts(make_user, [now] * 5 + [now - timedelta(minutes=1)])
+
+    ids, _ = walk_feed(client, limit=2)
+    assert ids == expected
+
+
+def test_malformed_cursor_is_rejected(app, client):
+    valid = app_module.encode_cursor(datetime.now(timezone.utc), 'post-id')
+    # Not base64 text, junk appended to a real cursor, and a cursor cut before the id
+    truncated = app_module.encode_cursor(datetime.now(timezone.utc), '')
+    for cursor in ('not-a-cursor', valid + '!!', truncated):
+        response = client.get('/api/posts', query_string={'cursor': cursor})
+        assert response.status_code == 400
+        assert response.get_json() == {"error": "Invalid cursor"}
@@ -0,0 +1,52 @@
+import app as app_module
+from models import Comment, CommentReaction, Post, Reaction
+
+db = app_module.db
+
+FEED_PAGE = 10
+# Cache version, page ids and one batched query per loaded relationship (9 today)
+MAX_FEED_STATEMENTS = 10
+
+
+def seed_feed(make_user, activity_per_post):
+    """A page of posts, each with activity_per_post comments (with one reaction each) and reactions."""
+    author = make_user('Author')
+    users = [make_user(f'User {i}') for i in range(activity_per_post)]
+    for i in range(FEED_PAGE):
+        post = Post(author_id=author.id, text=f'Post {i}', display_name='Author')
+        db.session.add(post)
+        db.session.flush()
+        for user in users:
+            comment = Comment(post_id=post.id, author_id=user.id, text='Comment')
+            db.session.add(comment)
+            db.session.flush()
+            db.session.add(CommentReaction(comment_id=comment.id, user_id=user.id, type='HEART'))
+            db.session.add(Reaction(post_id=post.id, user_id=user.id, type='HEART'))
+    db.session.commit()
+    db.session.expire_all()
+
+
+def feed_statement_count(client, statements, activity_per_post):
+    statements.clear()
+    response = client.get(f'/api/posts?limit={FEED_PAGE}')
+    assert response.status_code == 200
+    feed = response.get_json()
+    assert len(feed['posts']) == FEED_PAGE
+    assert all(len(post['comments']) == activity_per_post for post in feed['posts'])
+    return len(statements)
+
+
+def test_feed_query_count_does_not_grow_with_comments_and_reactions(app, client, statements, make_user):
+    counts = {}
+    for activity_per_post in (1, 50):
+        seed_feed(make_user, activity_per_post)
+        counts[activity_per_post] = feed_statement_count(client, statements, activity_per_post)
+        # Fresh tables for the next level; the version bump keeps the page cache out of it
+        db.session.remove()
+        db.drop_all()
+        db.create_all()
+        app_module.bump_feed_version()
+
+    # One IN (...) query per relationship, however many rows it returns
+    assert counts[50] == counts[1]
+    assert counts[50] <= MAX_FEED_STATEMENTS, counts
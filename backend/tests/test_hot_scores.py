@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta, timezone
+
+import app as app_module
+from models import DiscussionAnalytics, Post
+
+db = app_module.db
+
+
+def test_refresh_skips_posts_past_the_horizon(app, make_user):
+    author = make_user('Author')
+    now = datetime.now(timezone.utc)
+    analytics = {}
+    for name, age in (('fresh', timedelta(hours=5)), ('old', timedelta(days=10))):
+        post = Post(author_id=author.id, text=name, display_name='Author', created_at=now - age)
+        db.session.add(post)
+        db.session.flush()
+        analytics[name] = DiscussionAnalytics(post_id=post.id, discussion_score=10.0, hot_score=-1.0)
+        db.session.add(analytics[name])
+    db.session.commit()
+
+    assert app_module.refresh_hot_scores() == 1
+    db.session.expire_all()
+    assert analytics['fresh'].hot_score > 0
+    assert analytics['old'].hot_score == -1.0
@@ -0,0 +1,16 @@
+import app as app_module
+
+
+def test_top_survives_a_long_idle_period():
+    trending = app_module.HeavyHitters(k=5, half_life_seconds=1, width=64, depth=2)
+    trending.record(['ICU'], 'posts')
+    # Idle for far longer than 1024 half-lives, where 2 ** exponent overflows
+    trending._landmark -= 5000
+
+    topics, tracked = trending.top(5)
+    assert tracked == 1
+    assert topics[0]['tag'] == 'ICU'
+    assert topics[0]['post_count'] == 0
+
+    trending.record(['Cardio'], 'posts')
+    assert trending.top(1)[0][0]['tag'] == 'Cardio'
@@ -0,0 +1,55 @@
+import pytest
+
+import app as app_module
+from models import Notification
+
+db = app_module.db
+
+
+def notify(user):
+    db.session.add(Notification(user_id=user.id, type='reaction', title='New reaction', message='Ann reacted'))
+
+
+@pytest.fixture
+def sent_digests(monkeypatch):
+    sent = []
+    monkeypatch.setattr(
+        app_module, 'send_notification_digest_email',
+        lambda email, name, notifications, total_new: sent.append(email) or True
+    )
+    return sent
+
+
+def test_single_worker_presence_digests_only_offline_users(app, make_user, monkeypatch, sent_digests):
+    registry = app_module.PresenceRegistry(300, authoritative=True)
+    monkeypatch.setattr(app_module, 'presence', registry)
+    online, offline = make_user('Online'), make_user('Offline')
+    notify(online)
+    notify(offline)
+    db.session.commit()
+    registry.connect(online.id, 'sid-1')
+
+    assert app_module.send_notification_digests() == 1
+    assert sent_digests == [offline.email]
+
+
+def test_unshared_multi_worker_presence_refuses_digests(app, make_user, monkeypatch, sent_digests):
+    registry = app_module.PresenceRegistry(300, authoritative=False)
+    monkeypatch.setattr(app_module, 'presence', registry)
+    user = make_user('Offline')
+    notify(user)
+    db.session.commit()
+
+    # Emits still fail open, but digests must not act on that guess
+    assert registry.is_online(user.id)
+    with pytest.raises(RuntimeError):
+        app_module.send_notification_digests()
+    assert sent_digests == []
+
+
+def test_digest_command_refuses_without_shared_presence(app, monkeypatch, sent_digests):
+    monkeypatch.setattr(app_module, 'presence', app_module.PresenceRegistry(300, authoritative=True))
+    result = app.test_cli_runner().invoke(args=['send-notification-digests'])
+    assert result.exit_code != 0
+    assert 'refusing to send notification digests' in result.output
+    assert sent_digests == []
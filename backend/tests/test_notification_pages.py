@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+
+import app as app_module
+from models import Notification
+
+db = app_module.db
+
+
+def seed_notifications(user, created_ats, is_read=False):
+    notifications = [Notification(user_id=user.id, type='reaction', title='New reaction', message='Ann reacted',
+                                  is_read=is_read, created_at=created_at) for created_at in created_ats]
+    db.session.add_all(notifications)
+    return notifications
+
+
+def newest_first(notifications):
+    return [n.id for n in sorted(notifications, key=lambda n: (n.created_at, n.id), reverse=True)]
+
+
+def walk(client, headers, **params):
+    ids, cursor = [], ''
+    while cursor is not None:
+        response = client.get('/api/notifications', query_string={**params, 'cursor': cursor}, headers=headers)
+        assert response.status_code == 200
+        page = response.get_json()
+        ids += [notification['id'] for notification in page['notifications']]
+        cursor = page['nextCursor']
+    return ids
+
+
+def test_keyset_pages_cover_each_notification_once(app, client, make_user, access_token):
+    user, other = make_user('Nurse'), make_user('Other')
+    now = datetime.now(timezone.utc)
+    # Three notifications share a timestamp, so page boundaries fall inside the tie
+    unread = seed_notifications(user, [now] * 3 + [now - timedelta(minutes=1)])
+    read = seed_notifications(user, [now - timedelta(minutes=2)], is_read=True)
+    seed_notifications(other, [now])
+    db.session.commit()
+    headers = {'Authorization': f'Bearer {access_token(user)}'}
+
+    assert walk(client, headers, limit=2) == newest_first(unread + read)
+    assert walk(client, headers, limit=2, unread_only='true') == newest_first(unread)
+
+    first = client.get('/api/notifications', query_string={'cursor': '', 'limit': 2, 'includeTotal': 'true'},
+                       headers=headers).get_json()
+    assert first['total'] == 5
+
+
+def test_malformed_notification_cursor_is_rejected(app, client, make_user, access_token):
+    headers = {'Authorization': f'Bearer {access_token(make_user("Nurse"))}'}
+    response = client.get('/api/notifications?cursor=not-a-cursor', headers=headers)
+    assert response.status_code == 400
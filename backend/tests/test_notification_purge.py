@@ -0,0 +1,46 @@
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import app as app_module
+from models import Notification
+
+db = app_module.db
+
+
+def notify(user, age, is_read=True):
+    notification = Notification(user_id=user.id, type='reaction', title='New reaction', message='Ann reacted',
+                                is_read=is_read, created_at=datetime.now(timezone.utc) - age)
+    db.session.add(notification)
+    return notification
+
+
+def ids(notifications):
+    return {notification.id for notification in notifications}
+
+
+def test_purge_archives_to_gzipped_jsonl_then_deletes(app, make_user, monkeypatch, tmp_path):
+    monkeypatch.setattr(app_module, 'NOTIFICATION_MAX_PER_USER', 2)
+    user = make_user('Nurse')
+    expired = [notify(user, timedelta(days=100 + i)) for i in range(2)]
+    unread = notify(user, timedelta(days=120), is_read=False)
+    recent = [notify(user, timedelta(hours=i)) for i in range(4)]
+    db.session.commit()
+    expected_reasons = {**dict.fromkeys(ids(expired), 'expired'), **dict.fromkeys(ids(recent[2:]), 'over_cap')}
+
+    # batch_size=1 makes every group span several committed chunks
+    purged_expired, over_cap, archive_path = app_module.purge_notifications(batch_size=1, archive_dir=str(tmp_path))
+    assert (purged_expired, over_cap) == (2, 2)
+
+    with gzip.open(archive_path, 'rt', encoding='utf-8') as archive:
+        rows = [json.loads(line) for line in archive]
+    assert {row['id']: row['purgeReason'] for row in rows} == expected_reasons
+    # Unread notifications are never purged, however old
+    assert {row.id for row in Notification.query.all()} == ids([unread] + recent[:2])
+
+
+def test_purge_without_matches_writes_no_archive(app, make_user, tmp_path):
+    notify(make_user('Nurse'), timedelta(hours=1))
+    db.session.commit()
+    assert app_module.purge_notifications(archive_dir=str(tmp_path)) == (0, 0, None)
+    assert list(tmp_path.iterdir()) == []
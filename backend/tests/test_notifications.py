@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import app as app_module
+from models import Notification
+
+db = app_module.db
+
+
+def react(recipient, actor):
+    app_module.create_notification(
+        recipient.id, 'reaction', 'New reaction', f'{actor.name} reacted to your post',
+        group_key='post:1', actor=actor, action='reacted to your post'
+    )
+    db.session.commit()
+
+
+def test_coalesced_notification_counts_each_actor_once(app, make_user):
+    recipient = make_user('Recipient')
+    a, b, c, d = (make_user(name) for name in ('Ann', 'Bob', 'Cat', 'Dan'))
+    db.session.commit()
+
+    for actor in (a, b, c, d, a):
+        react(recipient, actor)
+
+    notification = Notification.query.one()
+    assert notification.actor_count == 4
+    assert [entry['name'] for entry in notification.latest_actors] == ['Ann', 'Dan', 'Cat']
+    assert notification.message == 'Ann and 3 others reacted to your post'
+
+
+def test_outbox_groups_per_room_and_drops_superseded_state_events():
+    outbox = app_module.SocketEmitOutbox()
+    batch = [
+        ('new_notification', {'id': 'n1'}, 'user_a'),
+        ('unread_count', {'unread_count': 1}, 'user_a'),
+        ('notification_updated', {'id': 'n2', 'actorCount': 2}, 'user_b'),
+        ('new_notification', {'id': 'n3'}, 'user_a'),
+        ('unread_count', {'unread_count': 2}, 'user_a'),
+        ('notification_updated', {'id': 'n2', 'actorCount': 3}, 'user_b'),
+    ]
+    assert outbox.collapse(batch) == [
+        ('user_a', [
+            ('new_notification', {'id': 'n1'}),
+            ('new_notification', {'id': 'n3'}),
+            ('unread_count', {'unread_count': 2}),
+        ]),
+        ('user_b', [('notification_updated', {'id': 'n2', 'actorCount': 3})]),
+    ]
+
+
+def test_unread_counts_are_not_cached_per_worker_when_several_workers_share_no_cache():
+    counters = app_module.UnreadCounters(300, local_cache=False)
+    counts = iter([3, 5])
+    assert counters.get('u1', lambda: next(counts)) == 3
+    counters.apply('u1', 1)
+    assert counters.get('u1', lambda: next(counts)) == 5
+
+
+def test_coalesce_window_is_anchored_on_the_first_event(app, make_user):
+    recipient = make_user('Recipient')
+    a, b, c = (make_user(name) for name in ('Ann', 'Bob', 'Cat'))
+    db.session.commit()
+    window = timedelta(seconds=app_module.NOTIFICATION_COALESCE_WINDOW_SECONDS)
+
+    react(recipient, a)
+    notification = Notification.query.one()
+    notification.first_event_at = datetime.now(timezone.utc) - window + timedelta(minutes=1)
+    db.session.commit()
+    react(recipient, b)
+    assert Notification.query.one().actor_count == 2
+
+    # Bob's event refreshed created_at, but the group still expires with its first event
+    notification.first_event_at = datetime.now(timezone.utc) - window - timedelta(minutes=1)
+    db.session.commit()
+    react(recipient, c)
+    assert Notification.query.count() == 2
+
+
+def test_actor_ids_are_capped_while_actor_count_keeps_counting(app, make_user, monkeypatch):
+    monkeypatch.setattr(app_module, 'NOTIFICATION_MAX_ACTOR_IDS', 2)
+    recipient = make_user('Recipient')
+    actors = [make_user(name) for name in ('Ann', 'Bob', 'Cat', 'Dan')]
+    db.session.commit()
+
+    for actor in actors:
+        react(recipient, actor)
+
+    notification = Notification.query.one()
+    assert notification.actor_ids == [actors[0].id, actors[1].id]
+    assert notification.actor_count == 4
+    assert notification.message == 'Dan and 3 others reacted to your post'
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta, timezone
+
+import app as app_module
+
+
+def test_one_worker_claims_each_interval(app):
+    runs = []
+    job = app_module.PeriodicJob('test-job', 60, lambda: runs.append(1))
+    other_worker = app_module.PeriodicJob('test-job', 60, lambda: runs.append(2))
+
+    owner = job.claim()
+    assert owner is not None
+    assert other_worker.claim() is None
+
+    # A finished run keeps the lease until the end of its interval
+    job.release(owner, datetime.now(timezone.utc))
+    assert other_worker.claim() is None
+
+    job.release(owner, datetime.now(timezone.utc) - timedelta(seconds=61))
+    assert other_worker.claim() is not None
+
+
+def test_release_does_not_shorten_a_lease_taken_over_by_another_worker(app):
+    job = app_module.PeriodicJob('test-job', 60, lambda: None)
+    stale_owner = job.claim()
+    app_module.PeriodicJobLock.query.update({app_module.PeriodicJobLock.locked_until: datetime.now(timezone.utc)})
+    app_module.db.session.commit()
+    assert job.claim() is not None
+
+    job.release(stale_owner, datetime.now(timezone.utc) - timedelta(seconds=61))
+    assert job.claim() is None
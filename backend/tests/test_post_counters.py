@@ -0,0 +1,37 @@
+import app as app_module
+from models import Post
+
+db = app_module.db
+
+
+def counters(post):
+    db.session.refresh(post)
+    return post.comment_count, post.reaction_count, dict(post.reaction_histogram or {})
+
+
+def test_counter_deltas_match_a_full_recompute(app, client, make_user, access_token):
+    author = make_user('Author')
+    ann, bob, cat = make_user('Ann'), make_user('Bob'), make_user('Cat')
+    post = Post(author_id=author.id, text='Post', display_name='Author')
+    db.session.add(post)
+    db.session.commit()
+
+    def act(user, path, body):
+        response = client.post(f'/api/posts/{post.id}/{path}', json=body,
+                               headers={'Authorization': f'Bearer {access_token(user)}'})
+        assert response.status_code in (200, 201)
+
+    act(ann, 'comments', {'text': 'First'})
+    act(bob, 'comments', {'text': 'Second'})
+    act(ann, 'reactions', {'type': 'HEART'})
+    act(bob, 'reactions', {'type': 'HEART'})
+    act(cat, 'reactions', {'type': 'FIRE'})
+    act(bob, 'reactions', {'type': 'CLAP'})  # changed
+    act(cat, 'reactions', {'type': 'FIRE'})  # removed
+
+    by_delta = counters(post)
+    assert by_delta == (2, 2, {'HEART': 1, 'CLAP': 1})
+
+    app_module.recompute_post_counters([post.id])
+    db.session.commit()
+    assert counters(post) == by_delta
@@ -0,0 +1,59 @@
+import importlib.util
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+import app as app_module
+from models import Post, PostTag
+
+db = app_module.db
+
+
+def test_normalize_tags_dedupes_case_insensitively_keeping_first_spelling():
+    assert app_module.normalize_tags(['ICU', ' icu ', 'Cardio', 'CARDIO', 7, '']) == ['ICU', 'Cardio']
+
+
+def test_sync_post_tags_respells_instead_of_duplicating(app, make_user):
+    author = make_user('Author')
+    post = Post(author_id=author.id, text='Post', display_name='Author')
+    db.session.add(post)
+    app_module.sync_post_tags(post, ['ICU', 'icu', 'Cardio'])
+    db.session.commit()
+    assert sorted(entry.tag for entry in PostTag.query.all()) == ['Cardio', 'ICU']
+
+    app_module.sync_post_tags(post, ['icu'])
+    db.session.commit()
+    assert [entry.tag for entry in PostTag.query.all()] == ['icu']
+    assert post.tags_list == ['icu']
+
+
+def load_migration(revision):
+    path = next((Path(__file__).parent.parent / 'migrations' / 'versions').glob(f'{revision}_*.py'))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_migration_backfills_post_tags_from_the_json_column(app, make_user):
+    author = make_user('Author')
+    posts = {
+        tags: Post(author_id=author.id, text='Post', display_name='Author', tags=tags)
+        for tags in ('["ICU", " icu ", "Cardio", 7, ""]', 'not json', '{"tag": "ICU"}', '[]')
+    }
+    db.session.add_all(posts.values())
+    db.session.commit()
+    tagged_id = posts['["ICU", " icu ", "Cardio", 7, ""]'].id
+    db.session.remove()
+
+    migration = load_migration('6d9a1e47c2f8')
+    with db.engine.begin() as connection:
+        PostTag.__table__.drop(connection)
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+
+    rows = PostTag.query.all()
+    assert sorted(entry.tag for entry in rows) == ['Cardio', 'ICU']
+    # Invalid JSON, a non-list and an empty list add nothing
+    assert {entry.post_id for entry in rows} == {tagged_id}
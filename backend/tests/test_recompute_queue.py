@@ -0,0 +1,44 @@
+import threading
+import time
+
+import app as app_module
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_burst_of_schedules_runs_one_recompute_per_post(app):
+    runs = []
+    queue = app_module.CoalescingRecomputeQueue(runs.append, debounce_seconds=0.1)
+    for _ in range(5):
+        queue.schedule('p1')
+    queue.schedule('p2')
+
+    assert wait_for(lambda: len(runs) == 2)
+    time.sleep(0.2)
+    assert sorted(runs) == ['p1', 'p2']
+
+
+def test_schedule_during_a_running_recompute_queues_exactly_one_rerun(app):
+    runs = []
+    started, release = threading.Event(), threading.Event()
+
+    def recompute(post_id):
+        runs.append(post_id)
+        started.set()
+        release.wait(2)
+
+    queue = app_module.CoalescingRecomputeQueue(recompute, debounce_seconds=0.01)
+    queue.schedule('p1')
+    assert started.wait(2)
+    for _ in range(3):
+        queue.schedule('p1')
+    release.set()
+
+    assert wait_for(lambda: len(runs) == 2)
+    time.sleep(0.1)
+    assert runs == ['p1', 'p1']
@@ -0,0 +1,26 @@
+import app as app_module
+
+
+def test_socket_without_token_is_refused(app):
+    client = app_module.socketio.test_client(app)
+    assert not client.is_connected()
+
+
+def test_socket_joins_only_its_own_room(app, make_user, access_token):
+    owner = make_user('Owner')
+    other = make_user('Other')
+    app_module.db.session.commit()
+
+    client = app_module.socketio.test_client(app, auth={'token': access_token(owner)})
+    assert client.is_connected()
+
+    client.emit('join_user_room', {'userId': other.id})
+    assert client.get_received() == []
+    assert not app_module.presence.is_online(other.id)
+
+    client.emit('join_user_room', {'userId': owner.id})
+    assert [message['name'] for message in client.get_received()] == ['unread_count']
+    assert app_module.presence.is_online(owner.id)
+
+    client.disconnect()
+    assert not app_module.presence.is_online(owner.id)
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta, timezone
+
+import app as app_module
+from models import Comment, Post, Reaction, TagActivityHourly
+
+db = app_module.db
+
+
+def bucket_totals():
+    return [
+        (bucket.posts, bucket.comments, bucket.reactions)
+        for bucket in TagActivityHourly.query.order_by(TagActivityHourly.hour).all()
+    ]
+
+
+def test_deleting_a_post_subtracts_its_comments_and_reactions(client, make_user, access_token):
+    author = make_user('Author')
+    fan = make_user('Fan')
+    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    post = Post(author_id=author.id, text='Post', display_name='Author', created_at=yesterday)
+    db.session.add(post)
+    app_module.sync_post_tags(post, ['ICU'])
+    app_module.record_tag_activity(['ICU'], posts=1, at=yesterday)
+    for moment in (yesterday, datetime.now(timezone.utc)):
+        db.session.add(Comment(post_id=post.id, author_id=fan.id, text='Comment', created_at=moment))
+        app_module.record_tag_activity(['ICU'], comments=1, at=moment)
+    db.session.add(Reaction(post_id=post.id, user_id=fan.id, type='HEART'))
+    app_module.record_tag_activity(['ICU'], reactions=1)
+    db.session.commit()
+    assert bucket_totals() == [(1, 1, 0), (0, 1, 1)]
+
+    response = client.delete(f'/api/posts/{post.id}', headers={'Authorization': f'Bearer {access_token(author)}'})
+    assert response.status_code == 200
+    assert bucket_totals() == [(0, 0, 0), (0, 0, 0)]
+
+
+def test_rollup_counts_never_go_negative(app):
+    app_module.record_tag_activity(['ICU'], reactions=-3)
+    assert TagActivityHourly.query.count() == 0
+
+    app_module.record_tag_activity(['ICU'], reactions=1)
+    app_module.record_tag_activity(['ICU'], reactions=-3)
+    db.session.commit()
+    assert bucket_totals() == [(0, 0, 0)]
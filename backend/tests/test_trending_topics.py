@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta, timezone
+
+import app as app_module
+from models import Comment, Post, Reaction
+
+db = app_module.db
+
+
+def test_trending_topics_aggregate_the_rebuilt_rollup(app, client, make_user):
+    author, fan, other = make_user('Author'), make_user('Fan'), make_user('Other')
+    now = datetime.now(timezone.utc)
+    for tags, created_at in ((['ICU'], now), (['ICU', 'Night shift'], now), (['Cardio'], now - timedelta(days=3))):
+        post = Post(author_id=author.id, text='Post', display_name='Author', created_at=created_at)
+        db.session.add(post)
+        db.session.flush()
+        app_module.sync_post_tags(post, tags)
+        if tags == ['ICU']:
+            db.session.add(Comment(post_id=post.id, author_id=fan.id, text='Comment'))
+            db.session.add_all([Reaction(post_id=post.id, user_id=user.id, type='HEART') for user in (fan, other)])
+    # Nothing went through the write paths, so the rollup only knows what the rebuild finds
+    app_module.rebuild_tag_activity(now - timedelta(days=7))
+    db.session.commit()
+
+    day = client.get('/api/trending-topics?period=24h').get_json()
+    assert day['total_topics'] == 2
+    assert day['trending_topics'] == [
+        {'tag': 'ICU', 'post_count': 2, 'comment_count': 1, 'reaction_count': 2, 'score': 2 * 1.0 + 0.5 + 2 * 0.3},
+        {'tag': 'Night shift', 'post_count': 1, 'comment_count': 0, 'reaction_count': 0, 'score': 1.0},
+    ]
+
+    week = client.get('/api/trending-topics?period=7d&limit=1').get_json()
+    assert week['total_topics'] == 3
+    assert [topic['tag'] for topic in week['trending_topics']] == ['ICU']
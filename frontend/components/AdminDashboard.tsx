@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useCallback } from 'react';
-import { getPendingUsers, approveUser, getAllUsers, updateUserRole, deleteUser, getPendingResources, approveResource, rejectResource, inactivateResource, reactivateResource, getPendingBlogs, approveBlog, rejectBlog, inactivateBlog, reactivateBlog, getAllBroadcastMessages, createBroadcastMessage, updateBroadcastMessage, deleteBroadcastMessage, toggleBroadcastMessageVisibility, getAllFeedbacks, updateFeedbackStatus, uploadImage, getAllPosts, adminDeletePost, getAllResources, getAllBlogs, getAbsoluteUrl, createNclexCourse, updateNclexCourse, deleteNclexCourse, getAdminNclexCourses, addNclexCourseResource, deleteNclexCourseResource, generateNclexQuestions, getNclexCourse, createNclexQuestion, updateNclexQuestion, deleteNclexQuestion, getPromotions, adminUpdatePromotionStatus, generateNewsletter, sendNewsletter, NewsletterDraft, createPromotion } from '../services/mockApi';
+import { getPendingUsers, approveUser, getAllUsers, updateUserRole, deleteUser, getPendingResources, approveResource, rejectResource, inactivateResource, reactivateResource, getPendingBlogs, approveBlog, rejectBlog, inactivateBlog, reactivateBlog, getAllBroadcastMessages, createBroadcastMessage, updateBroadcastMessage, deleteBroadcastMessage, toggleBroadcastMessageVisibility, getAllFeedbacks, updateFeedbackStatus, uploadImage, getAllPosts, getAdminMetrics, AdminMetrics, adminDeletePost, getAllResources, getAllBlogs, getAbsoluteUrl, createNclexCourse, updateNclexCourse, deleteNclexCourse, getAdminNclexCourses, addNclexCourseResource, deleteNclexCourseResource, generateNclexQuestions, getNclexCourse, createNclexQuestion, updateNclexQuestion, deleteNclexQuestion, getPromotions, adminUpdatePromotionStatus, generateNewsletter, sendNewsletter, NewsletterDraft, createPromotion } from '../services/mockApi';
 import { User, Resource, Blog, BroadcastMessage, Feedback, Post, View, NclexCourse, NclexCourseStatus, NclexResourceType, NclexQuestion, Promotion } from '../types';
 import Spinner from './Spinner';
 import ApprovalDetailView from './ApprovalDetailView';
@@ -15,6 +15,10 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ navigateTo }) => {
     const [pendingUsers, setPendingUsers] = useState<User[]>([]);
     const [allUsers, setAllUsers] = useState<User[]>([]);
     const [posts, setPosts] = useState<Post[]>([]);
+    // All users and all posts are large lists; they load when their tab is opened
+    const [allUsersLoaded, setAllUsersLoaded] = useState(false);
+    const [postsLoaded, setPostsLoaded] = useState(false);
+    const [metrics, setMetrics] = useState<AdminMetrics | null>(null);
     const [pendingResources, setPendingResources] = useState<Resource[]>([]);
     const [pendingBlogs, setPendingBlogs] = useState<Blog[]>([]);
     const [broadcastMessages, setBroadcastMessages] = useState<BroadcastMessage[]>([]);
@@ -100,10 +104,9 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ navigateTo }) => {
         setLoading(true);
         setError(null);
         try {
-            const [pendingUsersData, allUsersData, postsData, resources, blogs, broadcastData, feedbacksData, promotionsData] = await Promise.all([
+            const [pendingUsersData, metricsData, resources, blogs, broadcastData, feedbacksData, promotionsData] = await Promise.all([
                 getPendingUsers(),
-                getAllUsers(),
-                getAllPosts(),
+                getAdminMetrics(),
                 getAllResources(),
                 getAllBlogs(),
                 getAllBroadcastMessages(),
@@ -113,8 +116,7 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ navigateTo }) => {
                 getPromotions('ALL', { includeInactive: true })
             ]);
             setPendingUsers(pendingUsersData);
-            setAllUsers(allUsersData);
-            setPosts(postsData);
+            setMetrics(metricsData);
             setPendingResources(resources);
             setPendingBlogs(blogs);
             setBroadcastMessages(broadcastData);
@@ -162,15 +164,43 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ navigateTo }) => {
         }
     }, [activeTab, loadNclexCourses]);
 
+    useEffect(() => {
+        const loadTab = async () => {
+            try {
+                if (activeTab === 'ALL_USERS' && !allUsersLoaded) {
+                    setLoading(true);
+                    setAllUsers(await getAllUsers());
+                    setAllUsersLoaded(true);
+                } else if (activeTab === 'POSTS' && !postsLoaded) {
+                    setLoading(true);
+                    setPosts(await getAllPosts());
+                    setPostsLoaded(true);
+                }
+            } catch (err) {
+                setError(`Failed to fetch data.`);
+            } finally {
+                setLoading(false);
+            }
+        };
+        loadTab();
+    }, [activeTab, allUsersLoaded, postsLoaded]);
+
+    // The user list loads with its tab; once loaded, keep it (and the tab count) live
+    const refreshAllUsers = async () => {
+        setAllUsers(await getAllUsers());
+        setAllUsersLoaded(true);
+    };
+
     const handleApprove = async (id: string, type: 'USER' | 'RESOURCE' | 'BLOG') => {
         setApprovingId(id);
         try {
             if (type === 'USER') {
                 await approveUser(id);
                 setPendingUsers(prev => prev.filter(item => item.id !== id));
-                // Refresh all users to update the list
-                const updatedUsers = await getAllUsers();
-                setAllUsers(updatedUsers);
+                // Refresh all users to update the list, unless it has not been loaded yet
+                if (allUsersLoaded) {
+                    await refreshAllUsers();
+                }
             } else if (type === 'RESOURCE') {
                 await approveResource(id);
                 setPendingResources(prev => prev.filter(item => item.id !== id));
@@ -209,8 +239,7 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ navigateTo }) => {
         try {
             await updateUserRole(userId, newRole);
             // Refresh all users to update the list
-            const updatedUsers = await getAllUsers();
-            setAllUsers(updatedUsers);
+            await refreshAllUsers();
             setShowConfirmModal({show: false, type: 'role', user: null});
         } catch (err) {
             setError(`Failed to update user role.`);
@@ -224,8 +253,7 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ navigateTo }) => {
         try {
             await deleteUser(userId);
             // Refresh all users to update the list
-            const updatedUsers = await getAllUsers();
-            setAllUsers(updatedUsers);
+            await refreshAllUsers();
             setShowConfirmModal({show: false, type: 'delete', user: null});
         } catch (err) {
             setError(`Failed to delete user.`);
@@ -322,6 +350,7 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ navigateTo }) => {
         setApprovingId(postId);
         try {
             await adminDeletePost(postId);
+            setPosts(prev => prev.filter(post => post.id !== postId));
             fetchData();
         } catch (err) {
             setError('Failed to delete post');
@@ -1659,10 +1688,11 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ navigateTo }) => {
     return (
         <div className="max-w-6xl mx-auto bg-white p-6 rounded-lg shadow-lg">
             <h2 className="text-3xl font-bold text-gray-800 mb-6 border-b pb-4">Admin Dashboard</h2>
+            {metrics && <MetricsSummary metrics={metrics} />}
             <div className="flex border-b mb-6">
                 <TabButton title="Pending Users" count={pendingUsers.length} activeTab={activeTab} onClick={() => setActiveTab('PENDING_USERS')} />
-                <TabButton title="All Users" count={allUsers.length} activeTab={activeTab} onClick={() => setActiveTab('ALL_USERS')} />
-                <TabButton title="Posts" count={posts.length} activeTab={activeTab} onClick={() => setActiveTab('POSTS')} />
+                <TabButton title="All Users" count={allUsersLoaded ? allUsers.length : metrics?.totals.users ?? 0} activeTab={activeTab} onClick={() => setActiveTab('ALL_USERS')} />
+                <TabButton title="Posts" count={postsLoaded ? posts.length : metrics?.totals.posts ?? 0} activeTab={activeTab} onClick={() => setActiveTab('POSTS')} />
                 <TabButton title="Resources" count={pendingResources.length} activeTab={activeTab} onClick={() => setActiveTab('RESOURCES')} />
                 <TabButton title="Blogs" count={pendingBlogs.length} activeTab={activeTab} onClick={() => setActiveTab('BLOGS')} />
                 <TabButton title="Broadcast Messages" count={broadcastMessages.length} activeTab={activeTab} onClick={() => setActiveTab('BROADCAST_MESSAGES')} />
@@ -1948,6 +1978,32 @@ const AdminDashboard: React.FC<AdminDashboardProps> = ({ navigateTo }) => {
     );
 };
 
+const MetricsSummary: React.FC<{ metrics: AdminMetrics }> = ({ metrics }) => {
+    const lastWeek = metrics.activity.slice(-7);
+    const weekTotal = (key: 'posts' | 'comments' | 'reactions') => lastWeek.reduce((sum, day) => sum + day[key], 0);
+    const enrolled = metrics.courseEnrollments.reduce((sum, course) => sum + course.enrolled, 0);
+    const completed = metrics.courseEnrollments.reduce((sum, course) => sum + course.completed, 0);
+    const cards = [
+        { label: 'Users', value: metrics.totals.users, detail: `${metrics.pending.users} pending` },
+        { label: 'Posts', value: metrics.totals.posts, detail: `${weekTotal('posts')} in the last 7 days` },
+        { label: 'Comments', value: metrics.totals.comments, detail: `${weekTotal('comments')} in the last 7 days` },
+        { label: 'Reactions', value: metrics.totals.reactions, detail: `${weekTotal('reactions')} in the last 7 days` },
+        { label: 'Pending Reviews', value: metrics.pending.resources + metrics.pending.blogs + metrics.pending.feedbacks + metrics.pending.promotions, detail: `${metrics.pending.resources} resources, ${metrics.pending.blogs} blogs` },
+        { label: 'NCLEX Enrollments', value: enrolled, detail: `${completed} completed` },
+    ];
+    return (
+        <div className="grid grid-cols-2 md:grid-cols-3 lg:grid-cols-6 gap-3 mb-6">
+            {cards.map(card => (
+                <div key={card.label} className="bg-gray-50 border border-gray-200 rounded-lg p-3">
+                    <p className="text-xs text-gray-500">{card.label}</p>
+                    <p className="text-xl font-bold text-gray-800">{card.value}</p>
+                    <p className="text-xs text-gray-500">{card.detail}</p>
+                </div>
+            ))}
+        </div>
+    );
+};
+
 const TabButton: React.FC<{title: string, count: number, activeTab: string, onClick: () => void}> = ({ title, count, activeTab, onClick }) => {
     const isActive = activeTab === title.toUpperCase();
     return (
@@ -21,25 +21,21 @@ const NotificationBell: React.FC<NotificationBellProps> = ({ onOpenNotifications
             websocketService.connect(user.id);
             setIsConnected(websocketService.isConnected());
             
-            // Listen for new notifications via WebSocket
-            const handleNotification = (notification: any) => {
-                console.log('New notification received:', notification);
-                // Increment unread count when new notification arrives
-                setUnreadCount(prev => prev + 1);
-            };
-            
-            websocketService.onNotification(handleNotification);
+            // The server pushes the unread count on join and after every change
+            websocketService.onUnreadCount(setUnreadCount);
+            websocketService.onConnectionChange(setIsConnected);
             
-            // Fallback polling every 30 seconds (less frequent since we have WebSocket)
+            // Fallback polling every 60 seconds while the socket is down (it stops retrying after a few attempts)
             const pollInterval = setInterval(() => {
                 if (!websocketService.isConnected()) {
                     fetchUnreadCount();
                 }
-            }, 30000);
+            }, 60000);
             
             return () => {
                 clearInterval(pollInterval);
-                websocketService.offNotification(handleNotification);
+                websocketService.offUnreadCount(setUnreadCount);
+                websocketService.offConnectionChange(setIsConnected);
             };
         }
     }, [user]);
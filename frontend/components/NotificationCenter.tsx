@@ -20,8 +20,7 @@ const NotificationCenter: React.FC<NotificationCenterProps> = ({
     const [notifications, setNotifications] = useState<Notification[]>([]);
     const [unreadCount, setUnreadCount] = useState(0);
     const [loading, setLoading] = useState(false);
-    const [page, setPage] = useState(1);
-    const [hasMore, setHasMore] = useState(true);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
 
     useEffect(() => {
         if (isOpen && user) {
@@ -33,41 +32,58 @@ const NotificationCenter: React.FC<NotificationCenterProps> = ({
                 console.log('New notification received in center:', notification);
                 // Add new notification to the top of the list
                 setNotifications(prev => [notification, ...prev]);
-                // Increment unread count
-                setUnreadCount(prev => prev + 1);
+            };
+            
+            // Coalesced notifications are updated in place and move back to the top
+            const handleNotificationUpdate = (notification: any) => {
+                setNotifications(prev => [notification, ...prev.filter(n => n.id !== notification.id)]);
+            };
+            
+            // Notifications sent while the socket was down are not replayed; reload the first page on reconnect
+            const handleConnectionChange = (connected: boolean) => {
+                if (connected) {
+                    fetchNotifications(false);
+                }
             };
             
             websocketService.onNotification(handleNotification);
+            websocketService.onNotificationUpdate(handleNotificationUpdate);
+            // The server pushes the unread count after every change
+            websocketService.onUnreadCount(setUnreadCount);
+            websocketService.onConnectionChange(handleConnectionChange);
             
-            // Fallback polling every 30 seconds (less frequent since we have WebSocket)
+            // Fallback polling every 60 seconds while the socket is down
             const pollInterval = setInterval(() => {
                 if (!websocketService.isConnected()) {
                     // Don't show loading spinner on background refresh
                     fetchNotifications(false);
                     fetchUnreadCount();
                 }
-            }, 30000);
+            }, 60000);
             
             return () => {
                 clearInterval(pollInterval);
                 websocketService.offNotification(handleNotification);
+                websocketService.offNotificationUpdate(handleNotificationUpdate);
+                websocketService.offUnreadCount(setUnreadCount);
+                websocketService.offConnectionChange(handleConnectionChange);
             };
         }
     }, [isOpen, user]);
 
-    const fetchNotifications = async (showLoading: boolean = true) => {
+    const fetchNotifications = async (showLoading: boolean = true, cursor: string = '') => {
         if (!user) return;
         
         if (showLoading) setLoading(true);
         try {
-            const response = await getNotifications(page, 20, false);
+            const response = await getNotifications(cursor, 20, false);
             
-            if (page === 1) {
+            if (!cursor) {
                 setNotifications(response.notifications || []);
             } else {
                 setNotifications(prev => [...prev, ...(response.notifications || [])]);
             }
-            setHasMore(response.current_page < response.pages);
+            setNextCursor(response.nextCursor);
         } catch (error) {
             console.error('Failed to fetch notifications:', error);
             setNotifications([]); // Set empty array on error
@@ -249,13 +265,10 @@ const NotificationCenter: React.FC<NotificationCenterProps> = ({
                         </div>
                     )}
                     
-                    {hasMore && (
+                    {nextCursor && (
                         <div className="p-4 text-center">
                             <button
-                                onClick={() => {
-                                    setPage(prev => prev + 1);
-                                    fetchNotifications();
-                                }}
+                                onClick={() => fetchNotifications(true, nextCursor)}
                                 disabled={loading}
                                 className="px-4 py-2 bg-gray-100 text-gray-700 rounded-lg hover:bg-gray-200 disabled:opacity-50"
                             >
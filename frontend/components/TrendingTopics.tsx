@@ -11,7 +11,7 @@ const TrendingTopics: React.FC<TrendingTopicsProps> = ({ onTagClick, className =
     const [trendingData, setTrendingData] = useState<TrendingTopicsResponse | null>(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
-    const [selectedPeriod, setSelectedPeriod] = useState<'24h' | '7d' | '30d'>('24h');
+    const [selectedPeriod, setSelectedPeriod] = useState<'live' | '24h' | '7d' | '30d'>('24h');
 
     const fetchTrendingTopics = useCallback(async () => {
         try {
@@ -32,6 +32,7 @@ const TrendingTopics: React.FC<TrendingTopicsProps> = ({ onTagClick, className =
 
     const getPeriodLabel = (period: string) => {
         switch (period) {
+            case 'live': return 'Right Now';
             case '24h': return '24 Hours';
             case '7d': return '7 Days';
             case '30d': return '30 Days';
@@ -91,7 +92,7 @@ const TrendingTopics: React.FC<TrendingTopicsProps> = ({ onTagClick, className =
                     Trending Topics
                 </h3>
                 <div className="flex space-x-1">
-                    {(['24h', '7d', '30d'] as const).map((period) => (
+                    {(['live', '24h', '7d', '30d'] as const).map((period) => (
                         <button
                             key={period}
                             onClick={() => setSelectedPeriod(period)}
@@ -138,7 +139,9 @@ const TrendingTopics: React.FC<TrendingTopicsProps> = ({ onTagClick, className =
 
             <div className="mt-4 pt-4 border-t border-gray-100">
                 <p className="text-xs text-gray-500 text-center">
-                    Based on activity in the last {getPeriodLabel(selectedPeriod).toLowerCase()}
+                    {selectedPeriod === 'live'
+                        ? 'Based on recent activity, weighted toward the last hour'
+                        : `Based on activity in the last ${getPeriodLabel(selectedPeriod).toLowerCase()}`}
                 </p>
             </div>
         </div>
@@ -1022,8 +1022,9 @@ export const getDiscussionAnalytics = async (postId: string): Promise<any> => {
 };
 
 // --- NOTIFICATION API ---
-export const getNotifications = async (page: number = 1, limit: number = 20, unreadOnly: boolean = false): Promise<{ notifications: Notification[], total: number, pages: number, current_page: number }> => {
-    const response = await fetchWithAuth(`/notifications?page=${page}&limit=${limit}&unread_only=${unreadOnly}`);
+// Pass the previous page's nextCursor to continue; an empty cursor starts from the newest notification
+export const getNotifications = async (cursor: string = '', limit: number = 20, unreadOnly: boolean = false): Promise<{ notifications: Notification[], nextCursor: string | null, total?: number }> => {
+    const response = await fetchWithAuth(`/notifications?cursor=${encodeURIComponent(cursor)}&limit=${limit}&unread_only=${unreadOnly}`);
     return handleApiResponse(response);
 };
 
@@ -1135,6 +1136,20 @@ export const getAllPosts = async (): Promise<Post[]> => {
     return handleApiResponse(response);
 };
 
+export interface AdminMetrics {
+    usersByRole: Record<string, number>;
+    totals: { users: number; posts: number; comments: number; reactions: number };
+    activity: { date: string; posts: number; comments: number; reactions: number }[];
+    pending: { users: number; resources: number; blogs: number; feedbacks: number; promotions: number };
+    courseEnrollments: { courseId: string; title: string; status: string; enrolled: number; completed: number }[];
+    generatedAt: string;
+}
+
+export const getAdminMetrics = async (): Promise<AdminMetrics> => {
+    const response = await fetchWithAuth('/admin/metrics');
+    return handleApiResponse(response);
+};
+
 export const deletePost = async (postId: string): Promise<{ message: string }> => {
     const response = await fetchWithAuth(`/posts/${postId}`, {
         method: 'DELETE',
@@ -7,6 +7,9 @@ class WebSocketService {
     private maxReconnectAttempts = 5;
     private reconnectDelay = 1000;
     private notificationCallbacks: ((notification: any) => void)[] = [];
+    private notificationUpdateCallbacks: ((notification: any) => void)[] = [];
+    private unreadCountCallbacks: ((count: number) => void)[] = [];
+    private connectionCallbacks: ((connected: boolean) => void)[] = [];
 
     connect(userId: string) {
         if (this.socket?.connected) {
@@ -18,17 +21,21 @@ class WebSocketService {
             this.socket = io(import.meta.env.VITE_API_URL?.replace('/api', '') || 'http://localhost:5000', {
                 transports: ['websocket', 'polling'],
                 timeout: 20000,
-                forceNew: true
+                forceNew: true,
+                // The server takes the user from this token; unauthenticated sockets are refused
+                auth: { token: localStorage.getItem('accessToken') }
             });
 
             this.socket.on('connect', () => {
                 console.log('WebSocket connected');
                 this.reconnectAttempts = 0;
                 this.socket?.emit('join_user_room', { userId });
+                this.connectionCallbacks.forEach(callback => callback(true));
             });
 
             this.socket.on('disconnect', () => {
                 console.log('WebSocket disconnected');
+                this.connectionCallbacks.forEach(callback => callback(false));
                 this.handleReconnect(userId);
             });
 
@@ -42,6 +49,16 @@ class WebSocketService {
                 this.notificationCallbacks.forEach(callback => callback(notification));
             });
 
+            // A coalesced notification ("Ann and 11 others reacted...") was updated in place
+            this.socket.on('notification_updated', (notification) => {
+                this.notificationUpdateCallbacks.forEach(callback => callback(notification));
+            });
+
+            // Pushed on join and whenever the user's unread count changes
+            this.socket.on('unread_count', (data) => {
+                this.unreadCountCallbacks.forEach(callback => callback(data?.unread_count || 0));
+            });
+
         } catch (error) {
             console.error('Failed to initialize WebSocket:', error);
             this.handleReconnect(userId);
@@ -77,6 +94,31 @@ class WebSocketService {
         this.notificationCallbacks = this.notificationCallbacks.filter(cb => cb !== callback);
     }
 
+    onNotificationUpdate(callback: (notification: any) => void) {
+        this.notificationUpdateCallbacks.push(callback);
+    }
+
+    offNotificationUpdate(callback: (notification: any) => void) {
+        this.notificationUpdateCallbacks = this.notificationUpdateCallbacks.filter(cb => cb !== callback);
+    }
+
+    onUnreadCount(callback: (count: number) => void) {
+        this.unreadCountCallbacks.push(callback);
+    }
+
+    offUnreadCount(callback: (count: number) => void) {
+        this.unreadCountCallbacks = this.unreadCountCallbacks.filter(cb => cb !== callback);
+    }
+
+    // Called with true on every (re)connect and false on disconnect; events missed in between are not replayed
+    onConnectionChange(callback: (connected: boolean) => void) {
+        this.connectionCallbacks.push(callback);
+    }
+
+    offConnectionChange(callback: (connected: boolean) => void) {
+        this.connectionCallbacks = this.connectionCallbacks.filter(cb => cb !== callback);
+    }
+
     isConnected(): boolean {
         return this.socket?.connected || false;
     }
@@ -90,6 +90,9 @@ export interface Notification {
     message: string;
     data: { [key: string]: any };
     isRead: boolean;
+    groupKey?: string | null;
+    actorCount?: number;
+    latestActors?: { id: string; name: string; avatarUrl?: string | null }[];
     createdAt: string;
 }
 